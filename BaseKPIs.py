@@ -1,9 +1,10 @@
 # ブロック6: KPIの算出（Net/Paid/Returns/Rate/AvgPrice）
 import pandas as pd
 import numpy as np
+from io_cache import load
 
 CSV_PATH = "//"ここにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+df = load(CSV_PATH)
 
 paid_sales = df.loc[df["合計出荷金額"]>0, "合計出荷金額"].sum()
 net_sales = df["合計出荷金額"].sum()
@@ -1,40 +1,50 @@
+import codecs
 import csv
 
 CSV_PATH = "//”ファイルパスをここに記載。”//sample_sales_data.csv"
 
-def detect_encoding(path: str) -> str:
-    # 1) BOM検知でUTF-8 with BOMを優先
+def detect_encoding(path: str, sample: int = 65536) -> str:
+    # 先頭sampleバイトだけを1回読み込んで判定します
     with open(path, "rb") as fb:
-        start = fb.read(4)
-        if start.startswith(b"\xef\xbb\xbf"):
-            return "utf-8-sig"
-    # 2) utf-8で読めるか試行 → ダメならcp932（日本語Windows系）
+        head = fb.read(sample)
+    # 1) BOM検知でUTF-8 with BOMを優先
+    if head.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    # 2) ASCIIのみならutf-8で確定
+    if head.isascii():
+        return "utf-8"
+    # 3) utf-8で読めるか試行 → ダメならcp932（日本語Windows系）
+    #    サンプル末尾で多バイト文字が途切れても誤判定しないよう、インクリメンタルデコーダを使います
     for enc in ("utf-8", "cp932"):
         try:
-            with open(path, "r", encoding=enc) as f:
-                f.read(4096)
+            codecs.getincrementaldecoder(enc)().decode(head, final=False)
             return enc
         except UnicodeDecodeError:
             continue
-    # 3) 最後の手段
+    # 4) 最後の手段
     return "utf-8"
 
 def read_header_and_count(path: str, encoding: str):
     # Snifferで区切り文字を推定（基本はカンマ）
     with open(path, "r", encoding=encoding, newline="") as f:
         sample = f.read(8192)
-        f.seek(0)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=[",", "\t", ";", "|"])
-        except Exception:
-            dialect = csv.excel
-        reader = csv.reader(f, dialect)
-        try:
-            header = next(reader)
-        except StopIteration:
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=[",", "\t", ";", "|"])
+    except Exception:
+        dialect = csv.excel
+    with open(path, "rb") as fb:
+        first = fb.readline()
+        if not first:
             return [], 0  # 空ファイル
-        # 行数カウント（ヘッダ除く）
-        row_count = sum(1 for _ in reader)
+        header = next(csv.reader([first.decode(encoding).rstrip("\r\n")], dialect), [])
+        # 行数カウント（ヘッダ除く）: 本体はcsvで解析せず、改行バイトをまとめて数える
+        # ※引用符内に改行を含むセルがある場合は物理行数になります
+        row_count, last = 0, b"\n"
+        for buf in iter(lambda: fb.read(1 << 20), b""):
+            row_count += buf.count(b"\n")
+            last = buf[-1:]
+        if last != b"\n":
+            row_count += 1  # 最終行に改行がない場合
     return header, row_count
 
 
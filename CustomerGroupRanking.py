@@ -1,26 +1,35 @@
 # ブロック3: 顧客の階層構造（法人グループ→店舗）
-import pandas as pd
 import numpy as np
+from io_cache import load
 
 CSV_PATH = "//"ここにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+df = load(CSV_PATH)
 need = ["請求先顧客法人グループID","請求先顧客法人グループ法人名","出荷先顧客店舗ID","出荷先顧客店舗名","所在都道府県"]
 missing = [c for c in need if c not in df.columns]
 if missing:
     print("[不足列]", missing)
 else:
-    grp = df.groupby(["請求先顧客法人グループID","請求先顧客法人グループ法人名"], as_index=False) \
-            .agg(rows=("伝票番号","size") if "伝票番号" in df.columns else ("出荷先顧客店舗ID","size"),
+    gkeys = ["請求先顧客法人グループID","請求先顧客法人グループ法人名"]
+    skeys = gkeys + ["出荷先顧客店舗ID","出荷先顧客店舗名"]
+    cnt = "伝票番号" if "伝票番号" in df.columns else "出荷先顧客店舗ID"
+    grp = df.groupby(gkeys, as_index=False, observed=True) \
+            .agg(rows=(cnt,"size"),
                  stores=("出荷先顧客店舗ID","nunique"))
     grp = grp.sort_values("rows", ascending=False).head(30)
+    # 店舗単位の集計は全体で1回だけ行い、法人グループごとに取り出す
+    st_all = df.groupby(skeys, observed=True).agg(rows=(cnt,"size"))
+    # 店舗ごとの最頻都道府県は (店舗, 都道府県) 件数の最大から求める（グループごとのPython関数呼び出しを避ける）
+    pref_n = df.groupby(skeys + ["所在都道府県"], observed=True).size()
+    st_all["pref"] = pref_n.groupby(level=skeys, observed=True).idxmax().str[-1]
+    st_all["pref"] = st_all["pref"].fillna("")
+    st_all = st_all.reset_index()
+    st_by_grp = st_all.groupby(gkeys, observed=True, sort=False)
     for _, r in grp.iterrows():
         gid, gname, rows, stores = r["請求先顧客法人グループID"], r["請求先顧客法人グループ法人名"], int(r["rows"]), int(r["stores"])
         print(f"{gname} ({gid}) - 店舗数={stores} / 明細数={rows}")
-        sub = df[(df["請求先顧客法人グループID"]==gid) & (df["請求先顧客法人グループ法人名"]==gname)]
-        st = sub.groupby(["出荷先顧客店舗ID","出荷先顧客店舗名"], as_index=False) \
-                .agg(rows=("伝票番号","size") if "伝票番号" in df.columns else ("出荷先顧客店舗ID","size"),
-                     pref=("所在都道府県", lambda x: x.mode().iat[0] if not x.mode().empty else ""))
+        # 店舗IDがすべて欠損の法人グループは空の枝として扱う
+        st = st_by_grp.get_group((gid, gname)) if (gid, gname) in st_by_grp.groups else st_all.head(0)
         st = st.sort_values("rows", ascending=False).head(15)
-        for i, s in st.iterrows():
-            twig = "└─" if i == st.index[:len(st)].max() else "├─"
+        for i, (_, s) in enumerate(st.iterrows()):
+            twig = "└─" if i == len(st) - 1 else "├─"
             print(f"  {twig} {s['出荷先顧客店舗名']} ({s['出荷先顧客店舗ID']}) [{s['pref']}] - 明細数={int(s['rows'])}")
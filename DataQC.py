@@ -1,8 +1,10 @@
 # ブロック5: 品質チェック（無償/返品/金額一致）
 import pandas as pd
+import numpy as np
+from io_cache import load
 
 CSV_PATH = "//"ここにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+df = load(CSV_PATH).drop(columns="year_month", errors="ignore")  # 派生列は品質チェックの対象外
 tol = 0.5  # 円未満の誤差を吸収
 
 issues = []
@@ -18,19 +20,21 @@ if {"返品フラグ","個数","合計出荷金額"}.issubset(df.columns):
         x = df.loc[m].copy(); x["issue"]="RETURN_SIGN_MISMATCH"; issues.append(x)
 
 if {"無償出荷フラグ","返品フラグ","合計出荷金額","単価","個数"}.issubset(df.columns):
-    mask_paid = (df["無償出荷フラグ"] == 0) & (df["返品フラグ"] == 0) & (pd.to_numeric(df["合計出荷金額"], errors="coerce") > 0)
+    # 列をNumPy配列に一度だけ変換し、マスクと差分をまとめて計算
+    amt   = pd.to_numeric(df["合計出荷金額"], errors="coerce").to_numpy(dtype=np.float64)
+    price = pd.to_numeric(df["単価"], errors="coerce").to_numpy(dtype=np.float64)
+    qty   = pd.to_numeric(df["個数"], errors="coerce").to_numpy(dtype=np.float64)
+    mask_paid = (df["無償出荷フラグ"].to_numpy() == 0) & (df["返品フラグ"].to_numpy() == 0) & (amt > 0)
 
-    expected = pd.to_numeric(df.loc[mask_paid, "単価"], errors="coerce") * pd.to_numeric(df.loc[mask_paid, "個数"], errors="coerce")
-    actual   = pd.to_numeric(df.loc[mask_paid, "合計出荷金額"], errors="coerce")
-
-    diff = expected - actual
-    mask_mismatch = diff.abs() > tol
+    expected = price * qty
+    diff = expected - amt
+    mask_mismatch = mask_paid & (np.abs(diff) > tol)
 
     if mask_mismatch.any():
-        tmp = df.loc[mask_paid].loc[mask_mismatch].copy()
-        tmp["calc_diff"] = diff.loc[mask_mismatch]
-        tmp["expected_round0"] = expected.round(0).loc[mask_mismatch]
-        tmp["actual_round0"]   = actual.round(0).loc[mask_mismatch]
+        tmp = df.iloc[np.flatnonzero(mask_mismatch)].copy()
+        tmp["calc_diff"] = diff[mask_mismatch]
+        tmp["expected_round0"] = np.round(expected[mask_mismatch], 0)
+        tmp["actual_round0"]   = np.round(amt[mask_mismatch], 0)
         tmp["issue"] = "PRICE_QTY_MISMATCH"
         issues.append(tmp)
 
@@ -1,42 +1,55 @@
 # ブロック1: 厳密な型付け + 全カラムの定義表を表示（初心者向けシンプル版）
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 CSV_PATH = "//"ファイルパスをここに記載"//sample_sales_data.csv"
 
-def maybe_bool(s: pd.Series) -> bool:
-    true  = {"1","true","t","y","yes","はい","有"}
-    false = {"0","false","f","n","no","いいえ","無"}
-    vals = pd.Series(s.dropna().astype(str).str.strip().str.lower().unique())
-    return len(vals) > 0 and set(vals).issubset(true | false)
+TRUE_VALUES  = frozenset({"1","true","t","y","yes","はい","有"})
+FALSE_VALUES = frozenset({"0","false","f","n","no","いいえ","無"})
+BOOL_MAP = {**{k: True for k in TRUE_VALUES}, **{k: False for k in FALSE_VALUES}}
+
+# maybe_bool / length_class には欠損を除いた値（列ごとに1回だけ dropna したもの）を渡す
+def maybe_bool(v: pd.Series) -> bool:
+    if pd.api.types.is_bool_dtype(v): return not v.empty
+    if pd.api.types.is_float_dtype(v) or pd.api.types.is_datetime64_any_dtype(v): return False
+    # 文字列化・正規化は行数ではなく一意値の数だけ行う
+    u = pd.unique(v)
+    if len(u) == 0: return False
+    if pd.api.types.is_integer_dtype(v): return set(u.tolist()) <= {0, 1}
+    vals = pd.Series(u).astype(str).str.strip().str.lower()
+    return set(vals) <= TRUE_VALUES | FALSE_VALUES
 
 def to_boolean_nullable(s: pd.Series) -> pd.Series:
-    m = s.astype(str).str.strip().str.lower()
-    true  = {"1","true","t","y","yes","はい","有"}
-    false = {"0","false","f","n","no","いいえ","無"}
-    out = pd.Series(pd.NA, index=s.index, dtype="boolean")
-    out = out.mask(m.isin(true), True).mask(m.isin(false), False)
-    return out
+    # 1回の辞書引きで True/False/<NA> を決める（該当しない値は <NA>）
+    return s.astype("string").str.strip().str.lower().map(BOOL_MAP).astype("boolean")
 
-def length_class(s: pd.Series) -> str:
-    if s.dropna().empty: return "N/A"
-    l = s.dropna().astype(str).str.len()
-    return f"固定長({int(l.min())})" if l.min()==l.max() else f"可変長({int(l.min())}-{int(l.max())})"
+def length_class(v: pd.Series) -> str:
+    if v.empty: return "N/A"
+    # 文字列列はそのまま、それ以外は str() 表記にしてから、Arrowで文字数と最小/最大を一括計算
+    if not pd.api.types.is_string_dtype(v): v = v.astype(str)
+    mm = pc.min_max(pc.utf8_length(pa.array(v, type=pa.string()))).as_py()
+    mn, mx = mm["min"], mm["max"]
+    return f"固定長({mn})" if mn == mx else f"可変長({mn}-{mx})"
 
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+# ファイル本来の型を見るため、文字列を日時などに自動変換しないCエンジンで読み込みます
+df = pd.read_csv(CSV_PATH, encoding="utf-8-sig", engine="c", memory_map=True)
 
 # ここで“実際に”型変換を適用（最小限）
 if "出荷日" in df.columns:
     df["出荷日"] = pd.to_datetime(df["出荷日"], errors="coerce")
-for col in df.columns:
-    if maybe_bool(df[col]):
-        df[col] = to_boolean_nullable(df[col])
 
+# 列ごとに欠損除去を1回だけ行い、真偽判定・変換・長さ区分で同じ値を使い回す
 print("列名\tデータ型\t長さ区分")
 for col in df.columns:
+    v = df[col].dropna()
+    if maybe_bool(v):
+        df[col] = to_boolean_nullable(df[col])
+        v = df[col].dropna()
     s = df[col]
     if pd.api.types.is_datetime64_any_dtype(s): t = "datetime"
     elif pd.api.types.is_bool_dtype(s): t = "bool"
     elif pd.api.types.is_integer_dtype(s): t = "int"
     elif pd.api.types.is_float_dtype(s): t = "float"
     else: t = "string"
-    print(f"{col}\t{t}\t{length_class(s)}")
+    print(f"{col}\t{t}\t{length_class(v)}")
@@ -1,25 +1,37 @@
 # ブロック2: データ定義表（dtype/NULL/一意数/min-max/例値）
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 
 CSV_PATH = "//"ここにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+# ファイル本来の型を見るため、文字列を日時などに自動変換しないCエンジンで読み込みます
+df = pd.read_csv(CSV_PATH, encoding="utf-8-sig", engine="c", memory_map=True)
 if "出荷日" in df.columns:
     df["出荷日"] = pd.to_datetime(df["出荷日"], errors="coerce")
 
+# dtype.kind → 表示名（カテゴリ以外は辞書引き1回で決まる）
+DTYPE_KIND = {"M": "datetime64[ns]", "i": "int", "u": "int", "f": "float", "b": "bool"}
+
 def fmt_dtype(s: pd.Series) -> str:
     t = s.dtype
-    if pd.api.types.is_categorical_dtype(t): return "category"
-    if pd.api.types.is_datetime64_any_dtype(t): return "datetime64[ns]"
-    if pd.api.types.is_integer_dtype(t): return "int"
-    if pd.api.types.is_float_dtype(t): return "float"
-    if pd.api.types.is_bool_dtype(t): return "bool"
-    return str(t)
+    if isinstance(t, pd.CategoricalDtype): return "category"
+    return DTYPE_KIND.get(t.kind, str(t))
 
-print("列名\tdtype\t非NULL\tNULL\t一意数\tmin/max\t例(最大5)")
-for col in df.columns:
-    s = df[col]
-    dtype = fmt_dtype(s)
+def stats_arrow(s: pd.Series, c: pa.Array):
+    # 件数・一意数・min/max・例値をArrowの集計関数で1回ずつ計算
+    nulls = c.null_count
+    nonnull = len(c) - nulls
+    nunique = pc.count_distinct(c).as_py()
+    minmax = ""
+    if (pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s)) and nonnull > 0:
+        mm = pc.min_max(c).as_py()
+        minmax = f"{mm['min']} / {mm['max']}"
+    ex = pc.unique(pc.drop_null(c))[:5].to_pylist()  # 出現順の一意値（先頭5件）
+    return nonnull, nulls, nunique, minmax, ex
+
+def stats_pandas(s: pd.Series):
+    # Arrowに変換できない列（数値と文字列が混在するobject列など）はpandasで計算
     nonnull, nulls = int(s.notna().sum()), int(s.isna().sum())
     nunique = int(s.nunique(dropna=True))
     minmax = ""
@@ -27,5 +39,15 @@ for col in df.columns:
         ss = s.dropna()
         if len(ss) > 0:
             minmax = f"{ss.min()} / {ss.max()}"
-    examples = ", ".join([str(v) for v in s.dropna().unique()[:5]])
+    return nonnull, nulls, nunique, minmax, s.dropna().unique()[:5]
+
+print("列名\tdtype\t非NULL\tNULL\t一意数\tmin/max\t例(最大5)")
+for col in df.columns:
+    s = df[col]
+    dtype = fmt_dtype(s)
+    try:
+        nonnull, nulls, nunique, minmax, ex = stats_arrow(s, pa.array(s, from_pandas=True))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        nonnull, nulls, nunique, minmax, ex = stats_pandas(s)
+    examples = ", ".join([str(v) for v in ex])
     print("\t".join([col, dtype, str(nonnull), str(nulls), str(nunique), minmax, examples]))
@@ -1,23 +1,30 @@
 # ブロック12: 価格×数量ビン（数量帯別の単価）
 import pandas as pd
 import numpy as np
+from io_cache import load
 
 CSV_PATH = "//こちらにファイルパスを記載//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+df = load(CSV_PATH)
 
 
+# 数量帯（右閉区間）: 二分探索で各行の帯番号を求め、整数のまま集計してから最後にラベルへ戻す
+QTY_EDGES = np.array([0, 1, 3, 5, 10, 20, 50, 100, 1e9])
+QTY_LABELS = ["1", "2-3", "4-5", "6-10", "11-20", "21-50", "51-100", "100+"]
+
 paid = df[df["合計出荷金額"] > 0].copy()
-paid["bin_qty"] = pd.cut(
-    paid["個数"],
-    bins=[0, 1, 3, 5, 10, 20, 50, 100, 1e9],
-    right=True,
-    labels=["1", "2-3", "4-5", "6-10", "11-20", "21-50", "51-100", "100+"]
-)
-agg = paid.groupby("bin_qty", dropna=False).agg(
+qty = paid["個数"].to_numpy(dtype=np.float64)
+bins = np.searchsorted(QTY_EDGES, qty, side="left") - 1
+bins[(bins < 0) | (bins >= len(QTY_LABELS))] = -1  # 範囲外・欠損は -1（ラベルなし）
+paid["bin_qty"] = bins
+agg = paid.groupby("bin_qty").agg(
     Lines=("合計出荷金額", "size"),
     Qty=("個数", "sum"),
     PaidSales=("合計出荷金額", "sum")
 )
+# 該当行のない帯も0で表示し、範囲外の行があれば末尾に欠損ラベルで表示
+order = list(range(len(QTY_LABELS))) + ([-1] if (bins == -1).any() else [])
+agg = agg.reindex(order, fill_value=0)
+agg.index = agg.index.map(dict(enumerate(QTY_LABELS))).rename("bin_qty")
 agg["AvgPrice"] = agg["PaidSales"] / agg["Qty"].replace(0, np.nan)
 
 # ①指数表記を避けて実数表示、②小数点第二位まで
@@ -1,33 +1,39 @@
 # ブロック4: 製品の階層構造（グループ→サブカテゴリ→製品）。カラム名は処理するデータにより適宜変更すること。
-import pandas as pd
+from io_cache import load
 
 CSV_PATH = "//"ここにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
+df = load(CSV_PATH)
 need = ["製品グループ名","製品サブカテゴリ名","製品名称"]
 missing = [c for c in need if c not in df.columns]
 if missing:
     print("[不足列]", missing)
 else:
-    top = df.groupby("製品グループ名", as_index=False).agg(
-        rows=("伝票番号","size") if "伝票番号" in df.columns else ("製品名称","size"),
+    cnt = "伝票番号" if "伝票番号" in df.columns else "製品名称"
+    top = df.groupby("製品グループ名", as_index=False, observed=True).agg(
+        rows=(cnt,"size"),
         subcats=("製品サブカテゴリ名","nunique"),
         items=("製品名称","nunique"))
     top = top.sort_values("rows", ascending=False).head(20)
+    # サブカテゴリ・製品単位の集計は全体で1回だけ行い、親ごとに取り出す
+    subs_all = df.groupby(["製品グループ名","製品サブカテゴリ名"], as_index=False, observed=True).agg(
+        rows=(cnt,"size"),
+        items=("製品名称","nunique"))
+    leaves_all = df.groupby(["製品グループ名","製品サブカテゴリ名","製品名称"], as_index=False, observed=True).agg(
+        rows=(cnt,"size"))
+    subs_by_grp = subs_all.groupby("製品グループ名", observed=True, sort=False)
+    leaves_by_sub = leaves_all.groupby(["製品グループ名","製品サブカテゴリ名"], observed=True, sort=False)
     for _, g in top.iterrows():
         gname = g["製品グループ名"]
         print(f"{gname} - サブカテゴリ数={int(g['subcats'])} / 製品数={int(g['items'])} / 明細数={int(g['rows'])}")
-        sub_df = df[df["製品グループ名"] == gname]
-        subs = sub_df.groupby("製品サブカテゴリ名", as_index=False).agg(
-            rows=("伝票番号","size") if "伝票番号" in df.columns else ("製品名称","size"),
-            items=("製品名称","nunique"))
+        # 子（サブカテゴリ）がすべて欠損の親は空の枝として扱う
+        subs = subs_by_grp.get_group(gname) if gname in subs_by_grp.groups else subs_all.head(0)
         subs = subs.sort_values("rows", ascending=False).head(15)
-        for j, s in subs.iterrows():
-            twig = "└─" if j == subs.index[:len(subs)].max() else "├─"
+        for j, (_, s) in enumerate(subs.iterrows()):
+            twig = "└─" if j == len(subs) - 1 else "├─"
             print(f"  {twig} {s['製品サブカテゴリ名']} - 製品数={int(s['items'])} / 明細数={int(s['rows'])}")
-            leaf = sub_df[sub_df["製品サブカテゴリ名"]==s["製品サブカテゴリ名"]]
-            leaves = leaf.groupby("製品名称", as_index=False).agg(
-                rows=("伝票番号","size") if "伝票番号" in df.columns else ("製品名称","size"))
+            key = (gname, s["製品サブカテゴリ名"])
+            leaves = leaves_by_sub.get_group(key) if key in leaves_by_sub.groups else leaves_all.head(0)
             leaves = leaves.sort_values("rows", ascending=False).head(15)
-            for k, p in leaves.iterrows():
-                twig2 = "└─" if k == leaves.index[:len(leaves)].max() else "├─"
+            for k, (_, p) in enumerate(leaves.iterrows()):
+                twig2 = "└─" if k == len(leaves) - 1 else "├─"
                 print(f"    {twig2} {p['製品名称']} - 明細数={int(p['rows'])}")
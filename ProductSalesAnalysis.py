@@ -1,53 +1,44 @@
 # ブロック9: 製品サマリ（グループ/サブカテゴリ/製品）
-import pandas as pd
+import numpy as np
+from summaries import load_summary
 
 
-def format_decimal_full(number: float) -> str:
-    """指数表記を避け、十進数で全桁表示する。末尾の不要なゼロと小数点は削除する。"""
-    if pd.isna(number):
-        return ""
-    try:
-        # 整数値なら整数として表示
-        if float(number).is_integer():
-            return str(int(float(number)))
-        # 小数がある場合は固定小数で表現しつつ末尾ゼロを除去
-        text = format(float(number), 'f')
-        return text.rstrip('0').rstrip('.')
-    except Exception:
-        return str(number)
+def format_decimal_full(values) -> np.ndarray:
+    """指数表記を避け、十進数で全桁表示する（配列を一括変換）。末尾の不要なゼロと小数点は削除する。"""
+    arr = np.asarray(values, dtype=np.float64)
+    out = np.full(arr.shape, "", dtype=object)
+    valid = ~np.isnan(arr)
+    # 整数値は整数として表示
+    with np.errstate(invalid="ignore"):  # inf の剰余は NaN になる（整数扱いしない）
+        ints = valid & (np.mod(arr, 1) == 0)
+    out[ints] = arr[ints].astype(np.int64).astype(str)
+    # 小数がある場合は固定小数（小数6桁）で表現しつつ末尾ゼロを除去
+    frac = valid & ~ints
+    out[frac] = [np.format_float_positional(v, precision=6, unique=False, trim="-") for v in arr[frac]]
+    return out
 
 CSV_PATH = "//"こちらにファイルパスを記載"//sample_sales_data.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
 
 # グループ
-if {"製品グループ名","合計出荷金額"}.issubset(df.columns):
-    g = df.groupby("製品グループ名", as_index=False).agg(
-        NetSales=("合計出荷金額","sum"),
-        Items=("製品名称","nunique"),
-        Lines=("伝票番号","size") if "伝票番号" in df.columns else ("合計出荷金額","size"))
+g = load_summary(CSV_PATH, "product_group_summary")
+if g is not None:
     print("[product_summary: グループ 上位5]")
-    g_top = g.sort_values("NetSales", ascending=False).head(5).copy()
-    if "NetSales" in g_top.columns:
-        g_top["NetSales"] = g_top["NetSales"].apply(format_decimal_full)
+    g_top = g.nlargest(5, "NetSales")
+    g_top["NetSales"] = format_decimal_full(g_top["NetSales"].to_numpy())
     print(g_top.to_string(index=False))
 
 # サブカテゴリ
-if {"製品サブカテゴリ名","合計出荷金額"}.issubset(df.columns):
-    sc = df.groupby("製品サブカテゴリ名", as_index=False).agg(
-        NetSales=("合計出荷金額","sum"),
-        Items=("製品名称","nunique"))
+sc = load_summary(CSV_PATH, "product_subcategory_summary")
+if sc is not None:
     print("[product_summary: サブカテゴリ 上位5]")
-    sc_top = sc.sort_values("NetSales", ascending=False).head(5).copy()
-    if "NetSales" in sc_top.columns:
-        sc_top["NetSales"] = sc_top["NetSales"].apply(format_decimal_full)
+    sc_top = sc.nlargest(5, "NetSales")
+    sc_top["NetSales"] = format_decimal_full(sc_top["NetSales"].to_numpy())
     print(sc_top.to_string(index=False))
 
 # 製品
-if {"製品名称","合計出荷金額"}.issubset(df.columns):
-    it = df.groupby("製品名称", as_index=False).agg(
-        NetSales=("合計出荷金額","sum"))
+it = load_summary(CSV_PATH, "product_item_summary")
+if it is not None:
     print("[product_summary: 製品 上位5]")
-    it_top = it.sort_values("NetSales", ascending=False).head(5).copy()
-    if "NetSales" in it_top.columns:
-        it_top["NetSales"] = it_top["NetSales"].apply(format_decimal_full)
+    it_top = it.nlargest(5, "NetSales")
+    it_top["NetSales"] = format_decimal_full(it_top["NetSales"].to_numpy())
     print(it_top.to_string(index=False))
@@ -39,6 +39,8 @@
 - monthly_summary.csv, customer_group_summary.csv, store_summary.csv,
   product_summary.csv, prefecture_summary.csv, reps_customer_summary.csv,
   reps_company_summary.csv, price_quantity_bins.csv, quality_issues.csv
+- 各CSVと同じ名前の .parquet（型を保ったまま高速に再読み込みできる形式）も出力します。
+- 入力CSV・期間・許容差が前回の実行と同じ場合は、出力済みの結果をそのまま使い再計算を省略します（--force で再実行）。
 
 出力物（HTML）
 - sales_dashboard.html（時系列、顧客ツリーマップ、ランキング、価格×数量、地域、担当者など）
@@ -53,11 +55,15 @@ from __future__ import annotations
 
 import argparse
 # コマンドライン引数を扱うための標準ライブラリです。
+from concurrent.futures import ThreadPoolExecutor
+# 互いに独立した集計をスレッドで並行実行するために使います。
 from dataclasses import dataclass
 # 設定を表すデータ構造にデータクラスを使います。
+import hashlib
+# 入力と設定の組み合わせから、再計算の要否を判定する指紋（ハッシュ）を作ります。
 from pathlib import Path
 # パス操作を高可読にするPathオブジェクトを使います。
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 # 型ヒントのために汎用コレクション型を取り込みます。
 
 import numpy as np
@@ -70,9 +76,15 @@ import plotly.graph_objects as go
 # 低レベルAPI（柔軟なレイアウト制御）のためにGraph Objectsを使います。
 import plotly.io as pio
 # 図をHTML文字列に変換するための入出力ユーティリティを使います。
+import pyarrow as pa
+import pyarrow.csv as pacsv
+# 集計結果のCSV書き出しに、マルチスレッドで動くpyarrowのCSVライターを使います。
 import warnings
 # 将来の仕様変更に関する警告を抑制するためにwarningsを使います。
 
+from io_cache import load
+# CSVの読み込みを同梱のParquetキャッシュ経由で行います。
+
 # 将来のpandas/plotlyのobserved既定値変更に関する警告を非表示にします。
 warnings.filterwarnings("ignore", category=FutureWarning, module=r".*pandas.*")
 warnings.filterwarnings("ignore", category=FutureWarning, module=r".*plotly\.express\._core.*")
@@ -103,6 +115,9 @@ class AnalysisConfig:
     open_html_after_save: bool = False
     # 出力後にHTMLを既定ブラウザで開くかどうかのフラグです。
 
+    force: bool = False
+    # 入力・設定が前回と同じでも、再計算して出力し直すかどうかのフラグです。
+
 
 # =========================
 # 入出力と前処理
@@ -119,37 +134,12 @@ def load_sales_csv(csv_path: Path) -> pd.DataFrame:
       出荷時自社担当者テリトリコード, 製品グループ名, 製品サブカテゴリ名, 製品名称,
       単価, 個数, 合計出荷金額, 返品フラグ, 無償出荷フラグ
     """
-    df = pd.read_csv(csv_path, encoding="utf-8-sig")
-    # UTF-8（BOMつき）でCSVを読み込みます。Excel出力にも対応します。
-
-    # 基本型変換
-    df["出荷日"] = pd.to_datetime(df["出荷日"])  # 時系列集計のキー
-    # 出荷日を日付型に変換して時系列集計に使います。
-
-    # カテゴリ化（メモリ節約と処理高速化）
-    category_cols = [
-        "請求先顧客法人グループID",
-        "請求先顧客法人グループ法人名",
-        "出荷先顧客店舗ID",
-        "出荷先顧客店舗名",
-        "所在都道府県",
-        "顧客担当者ID",
-        "顧客担当者名",
-        "自社担当者ID",
-        "出荷時自社担当者名",
-        "出荷時自社担当者テリトリコード",
-        "製品グループ名",
-        "製品サブカテゴリ名",
-        "製品名称",
-    ]
-    for c in category_cols:
-        if c in df.columns:
-            df[c] = df[c].astype("category")
-            # 存在する列だけ安全にカテゴリ型へ変換します。
+    df = load(csv_path)
+    # UTF-8（BOMつき）でCSVを読み込みます。2回目以降はParquetキャッシュから読み込みます。
+    # カテゴリ化（メモリ節約と処理高速化）はキャッシュ作成時に済ませています（io_cache.CATEGORY_COLS）。
+    # 出荷日の日付型変換と年月のカテゴリ（year_month、月次集計のキー）もキャッシュ作成時に済ませています。
 
     # 補助列（利便性）
-    df["year_month"] = df["出荷日"].dt.to_period("M").astype(str)
-    # 年月の文字列を作って月次集計のキーにします。
     df["weekday"] = df["出荷日"].dt.weekday  # Monday=0
     # 曜日番号（0=月,6=日）を付与します。
     df["weekday_name"] = df["出荷日"].dt.day_name(locale="ja_JP") if hasattr(df["出荷日"].dt, "day_name") else df["出荷日"].dt.day_name()
@@ -211,16 +201,18 @@ def run_quality_checks(df: pd.DataFrame, tolerance: float) -> pd.DataFrame:
         # 該当行にラベルを付けて収集します。
 
     # 通常有償（無償0・返品0・金額>0）の金額一致チェック
-    mask_paid = (df["無償出荷フラグ"] == 0) & (df["返品フラグ"] == 0) & (df["合計出荷金額"] > 0)
+    amt = df["合計出荷金額"].to_numpy(dtype=np.float64)
+    # 金額列をNumPy配列に一度だけ変換し、以降のマスク計算に使います。
+    mask_paid = (df["無償出荷フラグ"].to_numpy() == 0) & (df["返品フラグ"].to_numpy() == 0) & (amt > 0)
     # 通常有償（無償/返品でなく、金額が正）の行を取り出します。
     # 許容差分
-    diff = (df.loc[mask_paid, "単価"] * df.loc[mask_paid, "個数"]) - df.loc[mask_paid, "合計出荷金額"]
+    diff = df["単価"].to_numpy(dtype=np.float64) * df["個数"].to_numpy(dtype=np.float64) - amt
     # 単価×個数と合計金額の差分を計算します。
-    mask_mismatch = diff.abs() > tolerance
-    # 許容差を超える不一致行を特定します。
+    mask_mismatch = mask_paid & (np.abs(diff) > tolerance)
+    # 通常有償のうち、許容差を超える不一致行を特定します。
     if mask_mismatch.any():
-        tmp = df.loc[mask_paid].loc[mask_mismatch].copy()
-        tmp["calc_diff"] = diff.loc[mask_mismatch]
+        tmp = df.iloc[np.flatnonzero(mask_mismatch)].copy()
+        tmp["calc_diff"] = diff[mask_mismatch]
         tmp["issue"] = "PRICE_QTY_MISMATCH"
         issues.append(tmp)
         # 差分列とラベルを付けて収集します。
@@ -242,22 +234,28 @@ def run_quality_checks(df: pd.DataFrame, tolerance: float) -> pd.DataFrame:
 
 
 def compute_core_kpis(df: pd.DataFrame) -> Dict[str, float]:
-    paid_sales = df.loc[df["合計出荷金額"] > 0, "合計出荷金額"].sum()
+    amt = df["合計出荷金額"].to_numpy()
+    qty = df["個数"].to_numpy()
+    # 金額・数量の列をNumPy配列として一度だけ取り出し、以降のKPIはすべて配列上で計算します（欠損は従来どおり合計から除外）。
+    paid_mask = amt > 0
+    # 有償（金額が正）の行です。売上と数量の両方で共用します。
+
+    paid_sales = np.nansum(amt[paid_mask])
     # 有償売上合計です。
-    net_sales = df["合計出荷金額"].sum()
+    net_sales = np.nansum(amt)
     # 正味売上（返品は負、無償は0を含む純額）です。
-    returns = df.loc[df["返品フラグ"] == 1, "合計出荷金額"].abs().sum()
+    returns = np.nansum(np.abs(amt[df["返品フラグ"].to_numpy() == 1]))
     # 返品金額の絶対値合計です。
     return_rate = (returns / paid_sales) if paid_sales > 0 else np.nan
     # 返品率は分母を有償売上に限定します。
-    free_count = int((df["無償出荷フラグ"] == 1).sum())
+    free_count = int(np.count_nonzero(df["無償出荷フラグ"].to_numpy() == 1))
     # 無償出荷の件数です。
     total_rows = int(len(df))
     # 全レコード件数です。
     free_rate = free_count / total_rows if total_rows > 0 else np.nan
     # 無償率（件数ベース）です。
 
-    qty_paid = df.loc[df["合計出荷金額"] > 0, "個数"].sum()
+    qty_paid = np.nansum(qty[paid_mask])
     # 有償の数量合計です。
     avg_price = (paid_sales / qty_paid) if qty_paid > 0 else np.nan
     # 有償の平均単価です。
@@ -275,21 +273,47 @@ def compute_core_kpis(df: pd.DataFrame) -> Dict[str, float]:
     # KPIを辞書で返します。
 
 
+def add_amount_parts(df: pd.DataFrame) -> pd.DataFrame:
+    """有償売上・返品金額・有償数量の補助列を付けたDataFrameを返します（集計を1回のgroupbyにまとめるため）。
+
+    main で一度だけ付与しておけば、各集計関数からの呼び出しでは何もせずそのまま返します。
+    """
+    if "_paid" in df.columns:
+        return df
+        # 付与済みならコピーを作らずにそのまま使います。
+    amt = df["合計出荷金額"].to_numpy()
+    # 金額列をNumPy配列として取り出します。
+    paid_mask = amt > 0
+    # 有償（金額が正）の行です。
+    return df.assign(
+        _paid=np.where(paid_mask, amt, 0.0),
+        _ret=np.where(df["返品フラグ"].to_numpy() == 1, np.abs(amt), 0.0),
+        _paid_qty=np.where(paid_mask, df["個数"].to_numpy(), 0),
+    )
+    # 有償以外・返品以外の行は0にしておくことで、合計がそのまま有償売上・返品金額・有償数量になります。
+
+
+def safe_divide(num: pd.Series, den: pd.Series) -> np.ndarray:
+    """num / den を列全体で一括計算します。分母が0以下の行はNaNにします（行ごとのapplyを使わない）。"""
+    n = num.to_numpy(dtype=np.float64)
+    d = den.to_numpy(dtype=np.float64)
+    # 分子・分母をfloat配列として取り出します。
+    return np.divide(n, d, out=np.full_like(n, np.nan), where=d > 0)
+    # 分母が正の行だけ割り算し、それ以外はNaNのまま返します。
+
+
 def monthly_summary(df: pd.DataFrame) -> pd.DataFrame:
-    # 基本集計
-    base = df.groupby("year_month", observed=False).agg(
+    # 基本集計と有償売上・返品を1回のgroupbyでまとめて集計
+    g = add_amount_parts(df).groupby("year_month", observed=True).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
+        PaidSales=("_paid", "sum"),
+        Returns=("_ret", "sum"),
     ).reset_index()
-    # 月ごとの基本指標を集計します。
-    # 有償売上と返品の別集計
-    paid = df[df["合計出荷金額"] > 0].groupby("year_month", observed=False)["合計出荷金額"].sum()
-    ret = df[df["返品フラグ"] == 1].groupby("year_month", observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum())
-    g = base.merge(paid.rename("PaidSales"), on="year_month", how="left").merge(ret.rename("Returns"), on="year_month", how="left")
-    g[["PaidSales", "Returns"]] = g[["PaidSales", "Returns"]].fillna(0.0)
-    g["ReturnRate"] = g.apply(lambda r: (r["Returns"] / r["PaidSales"]) if r["PaidSales"] > 0 else np.nan, axis=1)
+    # 月ごとの基本指標・有償売上・返品金額を集計します。
+    g["ReturnRate"] = safe_divide(g["Returns"], g["PaidSales"])
     g["FreeRate"] = g["FreeCount"] / g["Transactions"].replace({0: np.nan})
 
     # MoM（前月比）とYoY（前年同月比）
@@ -306,122 +330,144 @@ def customer_hierarchy_summaries(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Dat
     cg_keys = ["請求先顧客法人グループID", "請求先顧客法人グループ法人名"]
     st_keys = cg_keys + ["出荷先顧客店舗ID", "出荷先顧客店舗名"]
 
-    # 基本集計
-    cg_base = df.groupby(cg_keys, observed=False).agg(
+    # 基本集計と返品額・有償売上を1回のgroupbyでまとめて集計
+    store = add_amount_parts(df).groupby(st_keys, observed=True, sort=False, dropna=False).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
+        Returns=("_ret", "sum"),
+        PaidSales=("_paid", "sum"),
     ).reset_index()
-    # 法人グループ単位の基本集計です。
-    st_base = df.groupby(st_keys, observed=False).agg(
-        NetSales=("合計出荷金額", "sum"),
-        Quantity=("個数", "sum"),
-        Transactions=("伝票番号", "count"),
-        FreeCount=("無償出荷フラグ", "sum"),
-    ).reset_index()
-    # 店舗単位の基本集計です。
-
-    # 返品額と有償売上
-    cg_ret = df[df["返品フラグ"] == 1].groupby(cg_keys, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-    st_ret = df[df["返品フラグ"] == 1].groupby(st_keys, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-    cg_paid = df[df["合計出荷金額"] > 0].groupby(cg_keys, observed=False)["合計出荷金額"].sum().rename("PaidSales")
-    # 結合
-    cg = cg_base.merge(cg_ret, on=cg_keys, how="left").merge(cg_paid, on=cg_keys, how="left")
-    cg[["Returns", "PaidSales"]] = cg[["Returns", "PaidSales"]].fillna(0.0)
-    cg["ReturnRate"] = cg.apply(lambda r: (r["Returns"] / r["PaidSales"]) if r["PaidSales"] > 0 else np.nan, axis=1)
+    # 店舗単位の集計です（明細を走査するのはこの1回だけです）。店舗キーが欠損の行も法人グループの合計に含めるため、いったん残します。
+
+    # 法人グループのキーは店舗のキーの先頭部分なので、明細ではなく店舗の集計結果を合計して作ります。
+    # 合計・件数はどちらも足し合わせられる指標です（浮動小数の足し順が変わるため、末尾桁の丸め差は出ることがあります）。
+    cg = store.groupby(cg_keys, observed=True, sort=False)[
+        ["NetSales", "Quantity", "Transactions", "FreeCount", "Returns", "PaidSales"]
+    ].sum().reset_index()
+    # 法人グループ単位の集計です。
+    cg["ReturnRate"] = safe_divide(cg["Returns"], cg["PaidSales"])
     # 法人グループの返品率を計算します。
-
-    st_paid = df[df["合計出荷金額"] > 0].groupby(st_keys, observed=False)["合計出荷金額"].sum().rename("PaidSales")
-    store = st_base.merge(st_ret, on=st_keys, how="left").merge(st_paid, on=st_keys, how="left")
-    store[["Returns", "PaidSales"]] = store[["Returns", "PaidSales"]].fillna(0.0)
-    store["ReturnRate"] = store.apply(lambda r: (r["Returns"] / r["PaidSales"]) if r["PaidSales"] > 0 else np.nan, axis=1)
+    store = store[store[st_keys].notna().all(axis=1)].reset_index(drop=True)
+    # 店舗の集計からは、従来どおりキーが欠損の行を除きます。
+    store["ReturnRate"] = safe_divide(store["Returns"], store["PaidSales"])
     # 店舗の返品率を計算します。
 
-    return cg.sort_values("NetSales", ascending=False), store.sort_values("NetSales", ascending=False)
-    # 売上降順で並べた結果を返します。
+    return cg, store
+    # 並べ替えは行いません（図は上位N件だけを取り出し、CSVは保存時に売上降順へ並べます）。
 
 
 def product_summaries(df: pd.DataFrame) -> pd.DataFrame:
     keys = ["製品グループ名", "製品サブカテゴリ名", "製品名称"]
-    base = df.groupby(keys, observed=False).agg(
+    g = add_amount_parts(df).groupby(keys, observed=True, sort=False).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
+        Returns=("_ret", "sum"),
+        PaidSales=("_paid", "sum"),
+        PaidQty=("_paid_qty", "sum"),
     ).reset_index()
-    # 基本集計を行います。
-    ret = df[df["返品フラグ"] == 1].groupby(keys, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-    paid_sales = df[df["合計出荷金額"] > 0].groupby(keys, observed=False)["合計出荷金額"].sum().rename("PaidSales")
-    paid_qty = df[df["合計出荷金額"] > 0].groupby(keys, observed=False)["個数"].sum().rename("PaidQty")
-    g = base.merge(ret, on=keys, how="left").merge(paid_sales, on=keys, how="left").merge(paid_qty, on=keys, how="left")
-    for c in ["Returns", "PaidSales", "PaidQty"]:
-        g[c] = g[c].fillna(0.0)
-        # 欠損を0で補います。
-    g["AvgPricePaid"] = g.apply(lambda r: (r["PaidSales"] / r["PaidQty"]) if r["PaidQty"] > 0 else np.nan, axis=1)
-    return g.sort_values("NetSales", ascending=False)
-    # 売上降順で返します。
+    # 基本集計と返品額・有償売上・有償数量を1回のgroupbyで集計します。
+    g["AvgPricePaid"] = safe_divide(g["PaidSales"], g["PaidQty"])
+    return g
+    # 並べ替えは保存時に行います。
 
 
 def prefecture_summary(df: pd.DataFrame) -> pd.DataFrame:
     key = ["所在都道府県"]
-    base = df.groupby(key, observed=False).agg(
+    g = add_amount_parts(df).groupby(key, observed=True, sort=False).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
-        Stores=("出荷先顧客店舗ID", "nunique"),
+        Returns=("_ret", "sum"),
+        PaidSales=("_paid", "sum"),
     ).reset_index()
-    # 一意店舗数（Stores）を含む基本集計です。
-    ret = df[df["返品フラグ"] == 1].groupby(key, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-    paid = df[df["合計出荷金額"] > 0].groupby(key, observed=False)["合計出荷金額"].sum().rename("PaidSales")
-    g = base.merge(ret, on=key, how="left").merge(paid, on=key, how="left")
-    g[["Returns", "PaidSales"]] = g[["Returns", "PaidSales"]].fillna(0.0)
-    g["ReturnRate"] = g.apply(lambda r: (r["Returns"] / r["PaidSales"]) if r["PaidSales"] > 0 else np.nan, axis=1)
+    # 返品額・有償売上を含めて1回のgroupbyで集計します。
+
+    # 一意店舗数（Stores）はカテゴリコードの組（都道府県, 店舗ID）の重複を除いて数えます（nuniqueより高速）。
+    pref_cat = df["所在都道府県"].astype("category")
+    pc = pref_cat.cat.codes.to_numpy().astype(np.int64)
+    sc = df["出荷先顧客店舗ID"].astype("category").cat.codes.to_numpy().astype(np.int64)
+    # 都道府県・店舗IDを整数コードにします（欠損は -1）。
+    ok = (pc >= 0) & (sc >= 0)
+    n_store = int(sc.max()) + 1 if len(sc) else 1
+    pairs = np.unique(pc[ok] * n_store + sc[ok])
+    # (都道府県, 店舗) の組を1つの整数にして重複を除きます。
+    stores_per_pref = np.bincount(pairs // n_store, minlength=len(pref_cat.cat.categories))
+    # 都道府県コードごとに組の数を数えると、一意店舗数になります。
+    g.insert(g.columns.get_loc("FreeCount") + 1, "Stores", stores_per_pref[g["所在都道府県"].cat.codes.to_numpy()])
+    # 従来どおり FreeCount の直後に Stores 列を置きます。
+    g["ReturnRate"] = safe_divide(g["Returns"], g["PaidSales"])
     g["FreeRate"] = g["FreeCount"] / g["Transactions"].replace({0: np.nan})
-    return g.sort_values("NetSales", ascending=False)
-    # 売上降順で返します。
+    return g
+    # 並べ替えは保存時に行います。
 
 
 def reps_summaries(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     cust_keys = ["顧客担当者ID", "顧客担当者名"]
     comp_keys = ["自社担当者ID", "出荷時自社担当者名", "出荷時自社担当者テリトリコード"]
+    d = add_amount_parts(df)
+    # 補助列は両方の集計で共用します。
 
-    cust_base = df.groupby(cust_keys, observed=False).agg(
+    cust = d.groupby(cust_keys, observed=True, sort=False).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
+        Returns=("_ret", "sum"),
     ).reset_index()
-    comp_base = df.groupby(comp_keys, observed=False).agg(
+    comp = d.groupby(comp_keys, observed=True, sort=False).agg(
         NetSales=("合計出荷金額", "sum"),
         Quantity=("個数", "sum"),
         Transactions=("伝票番号", "count"),
         FreeCount=("無償出荷フラグ", "sum"),
+        Returns=("_ret", "sum"),
     ).reset_index()
+    # 基本集計と返品額を1回のgroupbyでまとめて集計します。
 
-    cust_ret = df[df["返品フラグ"] == 1].groupby(cust_keys, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-    comp_ret = df[df["返品フラグ"] == 1].groupby(comp_keys, observed=False)["合計出荷金額"].apply(lambda s: s.abs().sum()).rename("Returns")
-
-    cust = cust_base.merge(cust_ret, on=cust_keys, how="left").fillna({"Returns": 0.0})
-    comp = comp_base.merge(comp_ret, on=comp_keys, how="left").fillna({"Returns": 0.0})
-
-    return cust.sort_values("NetSales", ascending=False), comp.sort_values("NetSales", ascending=False)
-    # 売上降順で返します。
+    return cust, comp
+    # 並べ替えは保存時に行います。
 
 
 def price_quantity_bins(df: pd.DataFrame) -> pd.DataFrame:
     # 有償のみ対象
-    d = df[(df["合計出荷金額"] > 0)].copy()
-    if d.empty:
-        return d
+    amt_all = df["合計出荷金額"].to_numpy()
+    paid_mask = amt_all > 0
+    # 有償（金額が正）の行です。
+    if not paid_mask.any():
+        return df[paid_mask].copy()
         # データがなければ空のまま返します。
-    d["qty_bin"] = pd.cut(d["個数"], bins=[0, 10, 20, 50, 100, np.inf], labels=["<=10", "11-20", "21-50", "51-100", ">100"], right=True)
-    out = d.groupby("qty_bin", observed=False).agg(
-        PaidSales=("合計出荷金額", "sum"),
-        PaidQty=("個数", "sum"),
-        Transactions=("伝票番号", "count"),
-    ).reset_index()
+    amt = amt_all[paid_mask]
+    qty = df["個数"].to_numpy()[paid_mask]
+    # 有償行の金額・数量を配列で取り出します。
+
+    edges = np.array([0, 10, 20, 50, 100, np.inf])
+    labels = ["<=10", "11-20", "21-50", "51-100", ">100"]
+    # 数量帯の境界（右閉区間）とラベルです。
+    idx = np.searchsorted(edges, qty, side="left") - 1
+    # 二分探索で各行の帯番号を求めます（edges[i] < 個数 <= edges[i+1] なら i）。
+    valid = (idx >= 0) & (idx < len(labels))
+    idx, amt, qty = idx[valid], amt[valid], qty[valid]
+    # 0以下・欠損などどの帯にも入らない行は除外します。
+    n = len(labels)
+    cnt = np.bincount(idx, weights=df["伝票番号"].notna().to_numpy()[paid_mask][valid], minlength=n).astype(np.int64)
+    # 帯ごとの件数（伝票番号が欠損でない行数）です。
+    paid_qty = np.bincount(idx, weights=qty, minlength=n)
+    if np.issubdtype(qty.dtype, np.integer):
+        paid_qty = paid_qty.astype(np.int64)
+        # 数量が整数列なら合計も整数で返します（列は小さい整数型のことがあるため、合計は int64 にします）。
+    out = pd.DataFrame({
+        "qty_bin": pd.Categorical(labels, categories=labels, ordered=True),
+        "PaidSales": pd.Series(amt).groupby(idx).sum().reindex(range(n), fill_value=0.0).to_numpy(),
+        "PaidQty": paid_qty,
+        "Transactions": cnt,
+    })
+    # 件数・数量はbincountで一括計算し、金額は丸め誤差を抑えるため帯番号（整数）でのgroupby合計にします。
+    out = out[np.bincount(idx, minlength=n) > 0].reset_index(drop=True)
+    # 該当行のある帯だけを、帯の並び順で残します。
     out["AvgPrice"] = out["PaidSales"] / out["PaidQty"].replace({0: np.nan})
     # 帯ごとの平均単価を計算します。
     return out
@@ -432,6 +478,22 @@ def price_quantity_bins(df: pd.DataFrame) -> pd.DataFrame:
 # =========================
 
 
+def figure_snippet(fig: go.Figure, div_id: str) -> str:
+    """図をJSONのまま埋め込み、ブラウザ側の Plotly.newPlot で描画するHTML片を返します。
+
+    pio.to_html よりも生成する文字列が少なく、Plotly本体は1つ目の図で埋め込んだものを共用します。
+    """
+    return (
+        f'<div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+        f'<script type="text/javascript">'
+        f'(function () {{ var fig = {fig.to_json()}; '
+        f'Plotly.newPlot("{div_id}", fig.data, fig.layout, {{"responsive": true}}); }})();'
+        f"</script>"
+    )
+    # to_json はJSON内の "<" 等をエスケープ済みのため、scriptタグ内にそのまま埋め込めます。
+    # JSON化は全図を合わせても数十ミリ秒のため、プロセスプールで並列化すると起動や図の受け渡しの方が高くつきます（直列のまま）。
+
+
 def build_figures(
     df: pd.DataFrame,
     mon: pd.DataFrame,
@@ -466,8 +528,8 @@ def build_figures(
 
     # 2) 法人→店舗 ツリーマップ（売上寄与）
     # Treemap は weights（values列）がゼロ合計だとエラーになるため、有償売上>0のみを対象にする
-    top_store = store[store.get("PaidSales", 0) > 0].copy().sort_values("PaidSales", ascending=False).head(300)
-    # ツリーマップ用に売上上位の店舗を抽出します。
+    top_store = store[store.get("PaidSales", 0) > 0].nlargest(300, "PaidSales")
+    # ツリーマップ用に売上上位の店舗を抽出します（全件を並べ替えず、上位300件だけを選びます）。
     fig2 = px.treemap(
         top_store,
         path=[px.Constant("全体"), "請求先顧客法人グループ法人名", "出荷先顧客店舗名"],
@@ -477,26 +539,34 @@ def build_figures(
         title="顧客階層（法人→店舗）寄与ツリーマップ（累計売上）",
         labels={"PaidSales": "累計売上", "NetSales": "正味売上"},
     )
-    html_snippets.append(pio.to_html(fig2, include_plotlyjs=False, full_html=False))
-    # 2つ目以降はPlotly本体を外部参照にしてHTMLを軽量化します。
+    html_snippets.append(figure_snippet(fig2, "fig2"))
+    # 2つ目以降はPlotly本体を含めず、図のJSONだけを埋め込んでHTMLを軽量化します。
 
     # 2b) 法人→店舗 積み上げ帯グラフ（TopN店舗＋その他、PaidSales）
     band_src = store[["請求先顧客法人グループ法人名", "出荷先顧客店舗名", "PaidSales"]].copy()
     band_src = band_src[band_src["PaidSales"] > 0]
     # 積み上げ帯グラフ用にデータを整形します。
     if not band_src.empty:
-        # グループ別合計
-        grp_tot = band_src.groupby("請求先顧客法人グループ法人名", as_index=False)["PaidSales"].sum().rename(columns={"PaidSales": "GroupPaid"})
-        band_src = band_src.merge(grp_tot, on="請求先顧客法人グループ法人名", how="left")
-        # 各グループ内 TopN 選定
+        # 各グループ内 TopN 選定（グループ内を売上降順に並べ、先頭N件を残す。同額は元の並び順を優先）
         TOPN = 8
-        band_src["rank"] = band_src.groupby("請求先顧客法人グループ法人名")["PaidSales"].rank(ascending=False, method="first")
-        band_src["store_for_viz"] = np.where(band_src["rank"] <= TOPN, band_src["出荷先顧客店舗名"], "その他")
+        band_src = band_src.sort_values(["請求先顧客法人グループ法人名", "PaidSales"], ascending=[True, False], kind="stable")
+        top = band_src.groupby("請求先顧客法人グループ法人名", observed=True, sort=False).head(TOPN)
+        # 上位N店舗はそのまま残します。
+        rest = (
+            band_src.drop(top.index)
+            .groupby("請求先顧客法人グループ法人名", as_index=False, observed=True, sort=False)["PaidSales"].sum()
+            .assign(store_for_viz="その他")
+        )
+        # 残りの店舗はグループごとに「その他」へまとめます。
+        top = top.rename(columns={"出荷先顧客店舗名": "store_for_viz"})
         band_viz = (
-            band_src.groupby(["請求先顧客法人グループ法人名", "store_for_viz"], as_index=False)["PaidSales"].sum()
+            pd.concat([top[["請求先顧客法人グループ法人名", "store_for_viz", "PaidSales"]], rest], ignore_index=True)
+            .sort_values(["請求先顧客法人グループ法人名", "store_for_viz"])
+            .reset_index(drop=True)
         )
+        # グループ→店舗名の順に並べます（凡例・積み上げの順序を従来どおりにするため）。
         # グループ順を PaidSales 降順に
-        grp_order = band_viz.groupby("請求先顧客法人グループ法人名", as_index=False)["PaidSales"].sum().sort_values("PaidSales", ascending=False)["請求先顧客法人グループ法人名"].tolist()
+        grp_order = band_viz.groupby("請求先顧客法人グループ法人名", as_index=False, observed=True)["PaidSales"].sum().sort_values("PaidSales", ascending=False)["請求先顧客法人グループ法人名"].tolist()
         band_viz["請求先顧客法人グループ法人名"] = pd.Categorical(band_viz["請求先顧客法人グループ法人名"], categories=grp_order, ordered=True)
         fig2b = px.bar(
             band_viz,
@@ -508,53 +578,87 @@ def build_figures(
             title="顧客階層（法人→店舗）積み上げ帯（Top8店舗＋その他、累計売上）",
         )
         fig2b.update_layout(barmode="stack", legend_title_text="店舗", xaxis_title="累計売上")
-        html_snippets.append(pio.to_html(fig2b, include_plotlyjs=False, full_html=False))
+        html_snippets.append(figure_snippet(fig2b, "fig2b"))
         # HTML片として追加します。
 
     # 3) トップ店舗・トップ製品（棒グラフ）
-    fig3a = px.bar(store.head(20), x="出荷先顧客店舗名", y="NetSales", title="店舗別売上 Top20")
+    fig3a = px.bar(store.nlargest(20, "NetSales"), x="出荷先顧客店舗名", y="NetSales", title="店舗別売上 Top20")
     fig3a.update_layout(xaxis_tickangle=-45)
-    fig3b = px.bar(prod.head(20), x="製品名称", y="NetSales", title="製品別売上 Top20")
+    fig3b = px.bar(prod.nlargest(20, "NetSales"), x="製品名称", y="NetSales", title="製品別売上 Top20")
     fig3b.update_layout(xaxis_tickangle=-45)
-    html_snippets.append(pio.to_html(fig3a, include_plotlyjs=False, full_html=False))
-    html_snippets.append(pio.to_html(fig3b, include_plotlyjs=False, full_html=False))
+    html_snippets.append(figure_snippet(fig3a, "fig3a"))
+    html_snippets.append(figure_snippet(fig3b, "fig3b"))
     # ランキング図を追加します。
 
     # 4) 価格×数量（有償のみ）散布図
-    paid = df[df["合計出荷金額"] > 0]
-    sample_paid = paid.sample(min(5000, len(paid)), random_state=42) if len(paid) > 5000 else paid
-    # 価格×数量の散布図は最大5,000点にサンプリングします。
-    fig4 = px.scatter(sample_paid, x="個数", y="単価", color="製品グループ名", trendline="ols", title="価格×数量 散布図（有償のみ、最大5Kサンプル）")
-    html_snippets.append(pio.to_html(fig4, include_plotlyjs=False, full_html=False))
+    paid_idx = np.flatnonzero(df["合計出荷金額"].to_numpy() > 0)
+    # 有償行の位置だけを求めます。
+    x = df["個数"].to_numpy(dtype=np.float64)[paid_idx]
+    y = df["単価"].to_numpy(dtype=np.float64)[paid_idx]
+    fin = np.isfinite(x) & np.isfinite(y)
+    x, y = x[fin], y[fin]
+    # 回帰直線はサンプル前の有償行すべてで求めます（欠損でない点だけを使います）。
+    if len(paid_idx) > 5000:
+        paid_idx = np.sort(np.random.default_rng(42).choice(paid_idx, size=5000, replace=False))
+        # 価格×数量の散布図は最大5,000点にサンプリングします（行を取り出す前に位置で間引く）。
+    sample_paid = df.iloc[paid_idx, df.columns.get_indexer(["個数", "単価", "製品グループ名"])]
+    # サンプルした行の、散布図に使う3列だけを取り出します。
+    fig4 = px.scatter(sample_paid, x="個数", y="単価", color="製品グループ名", title="価格×数量 散布図（有償のみ、最大5Kサンプル、破線は全体の回帰直線）")
+    if len(x) >= 2 and np.ptp(x) > 0:
+        slope, intercept = np.polyfit(x, y, 1)
+        # 有償行全体で1本だけ最小二乗の直線を当てはめます（グループごとのOLSは行わない）。
+        xs = np.array([x.min(), x.max()])
+        fig4.add_trace(go.Scatter(x=xs, y=slope * xs + intercept, mode="lines", name="回帰直線（全体）", line=dict(color="#333333", dash="dash")))
+    html_snippets.append(figure_snippet(fig4, "fig4"))
     # 散布図とトレンドラインを追加します。
 
     # 5) 都道府県別 売上（棒）
     fig5 = px.bar(pref.sort_values("NetSales", ascending=False), x="所在都道府県", y="NetSales", title="都道府県別 売上")
     fig5.update_layout(xaxis_tickangle=-45)
-    html_snippets.append(pio.to_html(fig5, include_plotlyjs=False, full_html=False))
+    html_snippets.append(figure_snippet(fig5, "fig5"))
     # 都道府県別の棒グラフを追加します。
 
     # 6) 担当者（自社）Top20 時系列（合計ではなく月次 NetSales）
     # まず上位自社担当者を抽出
-    top_comp_ids = reps_comp.head(10)["自社担当者ID"].tolist()
-    work = df[df["自社担当者ID"].isin(top_comp_ids)].copy()
-    ts = work.groupby(["year_month", "出荷時自社担当者名"], as_index=False)["合計出荷金額"].sum()
+    top_comp_ids = reps_comp.nlargest(10, "NetSales")["自社担当者ID"].tolist()
+    # 担当者IDはカテゴリなので、文字列ではなくカテゴリのコード（整数）どうしで絞り込みます。
+    comp_id = df["自社担当者ID"].cat
+    top_codes = comp_id.categories.get_indexer(top_comp_ids)
+    # 集計に使う3列だけを取り出します。
+    work = df.loc[np.isin(comp_id.codes.to_numpy(), top_codes), ["year_month", "出荷時自社担当者名", "合計出荷金額"]]
+    ts = work.groupby(["year_month", "出荷時自社担当者名"], as_index=False, observed=True)["合計出荷金額"].sum()
     fig6 = px.line(ts, x="year_month", y="合計出荷金額", color="出荷時自社担当者名", title="上位 自社担当者×月次 売上推移")
-    html_snippets.append(pio.to_html(fig6, include_plotlyjs=False, full_html=False))
+    html_snippets.append(figure_snippet(fig6, "fig6"))
     # 上位担当者の月次売上推移を折れ線で追加します。
 
     # 7) 曜日×月 ヒートマップ（NetSales） — y軸を日本語曜日に変更
-    day = df.groupby(["year_month", "weekday_jp"], as_index=False)["合計出荷金額"].sum()
-    pivot = day.pivot(index="weekday_jp", columns="year_month", values="合計出荷金額").reindex(index=["月", "火", "水", "木", "金", "土", "日"])
+    ym = df["year_month"].astype("category")
+    wd = df["weekday_jp"].astype("category")
+    # 年月・曜日はカテゴリなので、そのコード（整数）で行列の位置を決めます。
+    ym_codes = ym.cat.codes.to_numpy().astype(np.int64)
+    wd_codes = wd.cat.codes.to_numpy().astype(np.int64)
+    ok = (ym_codes >= 0) & (wd_codes >= 0)
+    n_ym, n_wd = len(ym.cat.categories), len(wd.cat.categories)
+    flat = wd_codes[ok] * n_ym + ym_codes[ok]
+    # (曜日, 年月) を1次元の位置にまとめ、bincountで1回の走査で合計します（groupby+pivotを使わない）。
+    amt = np.nan_to_num(df["合計出荷金額"].to_numpy(dtype=np.float64)[ok], nan=0.0)
+    # 金額が欠損の行は合計から除きます（groupbyのsumと同じく、セル全体がNaNにならないように）。
+    sums = np.bincount(flat, weights=amt, minlength=n_wd * n_ym).reshape(n_wd, n_ym)
+    counts = np.bincount(flat, minlength=n_wd * n_ym).reshape(n_wd, n_ym)
+    sums[counts == 0] = np.nan
+    # 該当データのないセルは従来どおり空欄（NaN）にします。
+    used = counts.any(axis=0)
+    pivot = pd.DataFrame(sums[:, used], index=wd.cat.categories, columns=ym.cat.categories[used]).reindex(index=["月", "火", "水", "木", "金", "土", "日"])
+    # データのある年月の列だけを残し、曜日を月〜日の順に並べます。
     fig7 = px.imshow(pivot, labels=dict(x="year_month", y="曜日", color="NetSales"), title="曜日×月 ヒートマップ（NetSales）")
-    html_snippets.append(pio.to_html(fig7, include_plotlyjs=False, full_html=False))
+    html_snippets.append(figure_snippet(fig7, "fig7"))
     # 曜日×月のヒートマップを追加します。
 
     return html_snippets
 
 
-def build_dashboard_html(html_snippets: List[str], title: str = "Sales Dashboard") -> str:
-    """複数のPlotly HTML片を1つのHTMLにまとめる。"""
+def build_dashboard_html(html_snippets: List[str], title: str = "Sales Dashboard") -> Iterator[str]:
+    """複数のPlotly HTML片を1つのHTMLにまとめる（1つの文字列に連結せず、先頭から順に断片を返す）。"""
     container_css = """
     <style>
     body { font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, 'Noto Sans JP', 'Hiragino Kaku Gothic ProN', Meiryo, sans-serif; margin: 20px; }
@@ -563,7 +667,7 @@ def build_dashboard_html(html_snippets: List[str], title: str = "Sales Dashboard
     .note { color: #555; font-size: 0.9rem; }
     </style>
     """
-    parts = [
+    head = [
         "<!DOCTYPE html>",
         "<html lang=\"ja\">",
         "<head>",
@@ -574,10 +678,16 @@ def build_dashboard_html(html_snippets: List[str], title: str = "Sales Dashboard
         f"<h1>{title}</h1>",
         "<p class=\"note\">このページはPlotlyで生成されたインタラクティブなダッシュボードです。各グラフはホバー、ズーム、凡例クリックでインタラクションできます。</p>",
     ]
-    parts.extend([f"<div class=\"fig\">{frag}</div>" for frag in html_snippets])
-    parts.extend(["</body>", "</html>"])
-    return "\n".join(parts)
-    # 完成したHTML文字列を返します。
+    for line in head:
+        yield line + "\n"
+    for frag in html_snippets:
+        # 図のHTML片（1つ目はPlotly本体を含み数MB）は連結してコピーを作らず、そのまま返します。
+        yield "<div class=\"fig\">"
+        yield frag
+        yield "</div>\n"
+    yield "</body>\n"
+    yield "</html>"
+    # 従来の "\n".join と同じ内容（末尾の改行なし）になるように区切りを付けています。
 
 
 # =========================
@@ -585,37 +695,108 @@ def build_dashboard_html(html_snippets: List[str], title: str = "Sales Dashboard
 # =========================
 
 
+def write_csv_utf8_sig(path: Path, df: pd.DataFrame) -> None:
+    """DataFrameをpyarrowのCSVライターでUTF-8（BOMつき、Excel向け）のCSVに保存します。"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # インデックスは出力せず、列だけをArrowの表に変換します。
+    for i, name in enumerate(table.column_names):
+        s = df[name]
+        if pd.api.types.is_datetime64_any_dtype(s) and ((s.dt.floor("D") == s) | s.isna()).all():
+            table = table.set_column(i, name, table.column(i).cast(pa.date32()))
+            # 時刻を持たない日時列は、pandasのto_csvと同じく YYYY-MM-DD で書き出します。
+    with open(path, "wb") as fh:
+        fh.write(b"\xef\xbb\xbf")
+        # Excelで文字化けしないよう、先頭にUTF-8のBOMを書きます。
+        pacsv.write_csv(table, fh)
+        # 本体はpyarrowで一括して書き出します。
+
+
 def save_dataframes(out_dir: Path, frames: Dict[str, pd.DataFrame]) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
     # 出力ディレクトリを作成します（既存でもエラーにしません）。
-    for name, df in frames.items():
-        df.to_csv(out_dir / f"{name}.csv", index=False, encoding="utf-8-sig")
-        # 各DataFrameをUTF-8（BOMつき）で保存します。
-
-
-def save_dashboard_html(out_dir: Path, html: str, open_after: bool = False) -> Path:
+    with ThreadPoolExecutor() as ex:
+        futures = [ex.submit(write_csv_utf8_sig, out_dir / f"{name}.csv", df) for name, df in frames.items()]
+        futures += [
+            ex.submit(df.to_parquet, out_dir / f"{name}.parquet", engine="pyarrow", compression="zstd", index=False)
+            for name, df in frames.items()
+        ]
+        # 後続の分析で型を保ったまま高速に読み込めるよう、同じ名前のParquetも保存します（カテゴリ列は辞書エンコード）。
+    for fut in futures:
+        fut.result()
+        # 各DataFrameをUTF-8（BOMつき）で並行して保存し、失敗があればここで例外にします。
+
+
+def save_dashboard_html(out_dir: Path, html_snippets: List[str], title: str, open_after: bool = False) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     html_path = out_dir / "sales_dashboard.html"
-    html_path.write_text(html, encoding="utf-8")
-    # HTMLをファイルに書き出します。
+    with open(html_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(build_dashboard_html(html_snippets, title=title))
+    # HTMLを断片ごとにファイルへ書き出します（全体を1つの文字列にまとめてから書く二重のコピーを避けます）。
     if open_after:
-        try:
-            # macOS
-            import subprocess
-
-            subprocess.run(["open", str(html_path)], check=False)
-        except Exception:
-            pass
-            # 失敗しても致命的ではないので無視します。
+        open_html(html_path)
     return html_path
 
 
+def open_html(html_path: Path) -> None:
+    try:
+        # macOS
+        import subprocess
+
+        subprocess.run(["open", str(html_path)], check=False)
+    except Exception:
+        pass
+        # 失敗しても致命的ではないので無視します。
+
+
+# 出力する集計表（CSV/Parquet）の名前です。再計算を省略できるかの判定にも使います。
+OUTPUT_TABLES = [
+    "monthly_summary",
+    "customer_group_summary",
+    "store_summary",
+    "product_summary",
+    "prefecture_summary",
+    "reps_customer_summary",
+    "reps_company_summary",
+    "price_quantity_bins",
+    "quality_issues",
+]
+
+
+def input_fingerprint(cfg: AnalysisConfig) -> str:
+    """入力CSV（パス・更新時刻・サイズ）と分析設定、本スクリプト自身の更新時刻から、実行結果を識別する短いハッシュを返します。"""
+    st = cfg.input_csv.stat()
+    me = Path(__file__).stat()
+    # スクリプトを更新した場合も結果が変わりうるため、指紋に含めます。
+    key = f"{cfg.input_csv.resolve()}:{st.st_mtime_ns}:{st.st_size}:{cfg.start_date}:{cfg.end_date}:{cfg.price_multiplication_tolerance}:{me.st_mtime_ns}"
+    return hashlib.blake2b(key.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_marker_path(cfg: AnalysisConfig) -> Path:
+    """前回の実行内容を示す目印ファイル（出力ディレクトリ内の .cache_<指紋>）のパスを返します。"""
+    return cfg.output_dir / f".cache_{input_fingerprint(cfg)}"
+
+
 # =========================
 # メイン実行
 # =========================
 
 
 def main(cfg: AnalysisConfig) -> None:
+    # 入力・設定が前回と同じで、出力（HTMLと集計CSV）もすべて残っていれば再計算を省略します。
+    marker = cache_marker_path(cfg)
+    html_path = cfg.output_dir / "sales_dashboard.html"
+    outputs_exist = html_path.exists() and all((cfg.output_dir / f"{name}.csv").exists() for name in OUTPUT_TABLES)
+    if not cfg.force and marker.exists() and outputs_exist:
+        print(f"入力と設定が前回の実行と同じため、再計算を省略しました（再実行する場合は --force）: {cfg.output_dir}")
+        if cfg.open_html_after_save:
+            open_html(html_path)
+        return
+
+    # 出力を書き換え始める前に前回の目印を消します（途中で中断しても、古い目印で新旧混在の出力を再利用しないように）。
+    if cfg.output_dir.exists():
+        for old in cfg.output_dir.glob(".cache_*"):
+            old.unlink(missing_ok=True)
+
     # データ読み込み
     df_all = load_sales_csv(cfg.input_csv)
     df = filter_by_date(df_all, cfg.start_date, cfg.end_date)
@@ -623,35 +804,52 @@ def main(cfg: AnalysisConfig) -> None:
     # 品質チェック
     q = run_quality_checks(df, cfg.price_multiplication_tolerance)
 
-    # 集計
-    kpis = compute_core_kpis(df)
-    mon = monthly_summary(df)
-    cg, store = customer_hierarchy_summaries(df)
-    prod = product_summaries(df)
-    pref = prefecture_summary(df)
-    reps_c, reps_comp = reps_summaries(df)
-    pq = price_quantity_bins(df)
+    # 有償・返品の補助列を一度だけ付与し、集計すべてで共用します（関数ごとのコピーを避ける）。
+    df = add_amount_parts(df)
+
+    # 集計（各関数はdfを読むだけで互いに独立しているため、スレッドで並行実行します）
+    # pandas/NumPyの集計処理はC実装の内部でGILを解放するため、スレッドでも並行に進みます。
+    with ThreadPoolExecutor(max_workers=7) as ex:
+        f_kpis = ex.submit(compute_core_kpis, df)
+        f_mon = ex.submit(monthly_summary, df)
+        f_cust = ex.submit(customer_hierarchy_summaries, df)
+        f_prod = ex.submit(product_summaries, df)
+        f_pref = ex.submit(prefecture_summary, df)
+        f_reps = ex.submit(reps_summaries, df)
+        f_pq = ex.submit(price_quantity_bins, df)
+    kpis = f_kpis.result()
+    mon = f_mon.result()
+    cg, store = f_cust.result()
+    prod = f_prod.result()
+    pref = f_pref.result()
+    reps_c, reps_comp = f_reps.result()
+    pq = f_pq.result()
+    # すべての集計が終わってから結果を受け取ります（例外は result() で再送出されます）。
 
     # 可視化
     html_parts = build_figures(df, mon, cg, store, prod, pref, reps_c, reps_comp)
-    html_full = build_dashboard_html(html_parts, title="売上ダッシュボード（基礎分析）")
 
     # 保存（CSV）
+    # 集計表は未整列のまま図に渡しているため、人が読むCSVだけを売上降順に並べ替えます（全件の並べ替えはここで1回だけ）。
+    by_sales = dict(by="NetSales", ascending=False)
     outputs = {
         "monthly_summary": mon,
-        "customer_group_summary": cg,
-        "store_summary": store,
-        "product_summary": prod,
-        "prefecture_summary": pref,
-        "reps_customer_summary": reps_c,
-        "reps_company_summary": reps_comp,
+        "customer_group_summary": cg.sort_values(**by_sales),
+        "store_summary": store.sort_values(**by_sales),
+        "product_summary": prod.sort_values(**by_sales),
+        "prefecture_summary": pref.sort_values(**by_sales),
+        "reps_customer_summary": reps_c.sort_values(**by_sales),
+        "reps_company_summary": reps_comp.sort_values(**by_sales),
         "price_quantity_bins": pq,
         "quality_issues": q,
     }
     save_dataframes(cfg.output_dir, outputs)
 
     # 保存（HTML）
-    html_path = save_dashboard_html(cfg.output_dir, html_full, open_after=cfg.open_html_after_save)
+    html_path = save_dashboard_html(cfg.output_dir, html_parts, title="売上ダッシュボード（基礎分析）", open_after=cfg.open_html_after_save)
+
+    # すべて出力できたら、今回の入力・設定の目印を残します。
+    marker.touch()
 
     # コンソールに要約を出力（学習・検収用）
     print("=== KPI Summary ===")
@@ -675,6 +873,7 @@ def parse_args() -> AnalysisConfig:
     p.add_argument("--end", type=str, default=None, help="分析終了日（YYYY-MM-DD）。省略時は全期間")
     p.add_argument("--tol", type=float, default=0.01, help="単価×個数と合計金額の一致許容差（品質チェック）")
     p.add_argument("--open-html", action="store_true", help="出力後にHTMLを既定ブラウザで開く（macOSなど）")
+    p.add_argument("--force", action="store_true", help="入力・設定が前回と同じでも再計算して出力し直す")
 
     a = p.parse_args()
     # 実際に引数を解析します。
@@ -688,6 +887,7 @@ def parse_args() -> AnalysisConfig:
         end_date=end,
         price_multiplication_tolerance=a.tol,
         open_html_after_save=a.open_html,
+        force=a.force,
     )
     # 解析結果を設定オブジェクトにまとめて返します。
 
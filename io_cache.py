@@ -0,0 +1,126 @@
+# 共通: CSV読み込みキャッシュ（Parquetサイドカー）
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
+
+# カテゴリ化する列（メモリ節約と集計高速化）。キャッシュ作成時の読み込みで直接カテゴリとして読みます。
+CATEGORY_COLS = [
+    "請求先顧客法人グループID",
+    "請求先顧客法人グループ法人名",
+    "出荷先顧客店舗ID",
+    "出荷先顧客店舗名",
+    "所在都道府県",
+    "顧客担当者ID",
+    "顧客担当者名",
+    "自社担当者ID",
+    "出荷時自社担当者名",
+    "出荷時自社担当者テリトリコード",
+    "製品グループ名",
+    "製品サブカテゴリ名",
+    "製品名称",
+]
+
+# 読み込み時に型を明示する列（型推定を省き、文字列列はArrow文字列として保持します）。
+DTYPES = {
+    "伝票番号": "string[pyarrow]",
+}
+# 数値列は空欄や「不明」などの不正な値が1つあっても読み込めるよう、読み込み時には型を指定せず、読み込み後に数値へ変換します（不正な値は NaN）。
+# 金額・単価は円の合計を誤差なく出すため float64 にします（float32 は有効桁が約7桁しかありません）。
+FLOAT_COLS = ["単価", "合計出荷金額"]
+# 個数・フラグは欠損がなければ収まる最小の整数型（フラグは int8）へ縮めます（欠損があれば浮動小数のまま）。
+INT_COLS = ["個数", "返品フラグ", "無償出荷フラグ"]
+DATE_COLS = ["出荷日"]
+DATE_FORMAT = "%Y-%m-%d"
+
+# キャッシュの形式の版（Parquetのメタデータに保存）。列の型・派生列など、キャッシュの中身が変わる変更をしたら上げてください。
+# 版が一致しないキャッシュは、CSVより新しくても作り直します。
+CACHE_VERSION = "1"
+VERSION_KEY = b"sales_cache_version"
+
+
+def read_csv(path, **kwargs) -> pd.DataFrame:
+    """CSVを読み込みます。pyarrowエンジン（マルチスレッド）を優先し、使えない場合はCエンジン＋memory_mapで読み込みます。
+
+    UTF-8のBOMはどちらのエンジンでも読み飛ばされます。
+    """
+    try:
+        return pd.read_csv(path, engine="pyarrow", **kwargs)
+    except (ImportError, ValueError):
+        # pyarrow未導入、またはpyarrowで解析できない場合（UTF-8以外の文字コードなど）
+        return pd.read_csv(path, engine="c", memory_map=True, encoding="utf-8-sig", **kwargs)
+
+
+def write_parquet(df: pd.DataFrame, path, version: str = CACHE_VERSION) -> None:
+    """DataFrameをzstd圧縮のParquetに保存し、キャッシュの版をメタデータに書き込みます。"""
+    t = pa.Table.from_pandas(df, preserve_index=False)
+    t = t.replace_schema_metadata({**(t.schema.metadata or {}), VERSION_KEY: version.encode()})
+    pq.write_table(t, path, compression="zstd")
+
+
+def is_fresh(cache_path: Path, csv_path: Path, version: str = CACHE_VERSION) -> bool:
+    """キャッシュがCSVより新しく、かつ版が一致していれば True を返します。"""
+    if not cache_path.exists() or cache_path.stat().st_mtime < csv_path.stat().st_mtime:
+        return False
+    try:
+        meta = pq.read_schema(cache_path).metadata or {}
+    except (OSError, ValueError):
+        # 壊れた・書きかけのファイルは作り直します
+        return False
+    return meta.get(VERSION_KEY) == version.encode()
+
+
+def load(path) -> pd.DataFrame:
+    """CSVを読み込みます。初回はCSVと同じ場所に .parquet を作成し、2回目以降はそちらを読み込みます。
+
+    出荷日は日付型に変換済みで、年月（"YYYY-MM"）の year_month 列を追加して返します。
+    CSVの方が新しい（更新された）場合や、キャッシュの版（CACHE_VERSION）が違う場合はキャッシュを作り直します。CSVの場所に書き込めない場合はキャッシュを作らずに読み込みます。
+    同じプロセス内で同じCSVを再度読み込む場合は、読み込み済みのDataFrameを再利用します。
+    """
+    csv_path = Path(path).resolve()
+    # 列の追加・差し替えが呼び出し元どうしで影響しないよう、浅いコピーを返します
+    return _load(csv_path, csv_path.stat().st_mtime).copy(deep=False)
+
+
+@lru_cache(maxsize=4)
+def _load(csv_path: Path, mtime: float) -> pd.DataFrame:
+    """load の本体です。(パス, 更新時刻) ごとに結果をプロセス内で保持します。"""
+    cache_path = csv_path.with_suffix(".parquet")
+    if is_fresh(cache_path, csv_path):
+        df = pd.read_parquet(cache_path, engine="pyarrow", memory_map=True)
+        # Parquetからは文字列の格納方式が戻らないため、明示した型を当て直します（対象列のみ）
+        return df.astype({c: t for c, t in DTYPES.items() if c in df.columns}, copy=False)
+
+    cols = pd.read_csv(csv_path, encoding="utf-8-sig", nrows=0).columns
+    dtype = {c: t for c, t in DTYPES.items() if c in cols}
+    dtype.update({c: "category" for c in CATEGORY_COLS if c in cols})
+    df = read_csv(
+        csv_path,
+        dtype=dtype,
+        parse_dates=[c for c in DATE_COLS if c in cols],
+    )
+    # 読み込み時に日付にならなかった列（不正な値や "YYYY/MM/DD" などの書式を含む）だけを変換し、月次集計用の年月（カテゴリ）もここで作ります
+    for c in DATE_COLS:
+        if c in df.columns and not pd.api.types.is_datetime64_any_dtype(df[c]):
+            parsed = pd.to_datetime(df[c], format=DATE_FORMAT, errors="coerce")
+            if parsed.isna().sum() > df[c].isna().sum():
+                # 既定の書式で読めない値があれば、値ごとに書式を推定して読み直します（それでも読めない値だけ NaT）
+                parsed = pd.to_datetime(df[c], format="mixed", errors="coerce")
+            df[c] = parsed
+    for c in FLOAT_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    for c in INT_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce", downcast="integer")
+    if "出荷日" in df.columns:
+        df["year_month"] = pd.Categorical(df["出荷日"].to_numpy().astype("datetime64[M]").astype(str))
+    try:
+        write_parquet(df, cache_path)
+    except OSError:
+        # CSVの場所に書き込めない（読み取り専用・容量不足など）場合は、キャッシュを作らずにそのまま返します（書きかけのファイルは消します）
+        with suppress(OSError):
+            cache_path.unlink(missing_ok=True)
+    return df
@@ -0,0 +1,105 @@
+# 共通: ブロック7〜11の集計をまとめて作成し、Parquetに保存して再利用
+import numpy as np
+import pandas as pd
+from contextlib import suppress
+from pathlib import Path
+from io_cache import CACHE_VERSION, is_fresh, load, write_parquet
+
+CUSTOMER_GROUP_KEYS = ["請求先顧客法人グループID","請求先顧客法人グループ法人名"]
+STORE_KEYS = ["出荷先顧客店舗ID","出荷先顧客店舗名"]
+REPS_CUSTOMER_KEYS = ["顧客担当者ID","顧客担当者名"]
+REPS_COMPANY_KEYS = ["自社担当者ID","出荷時自社担当者名"]
+
+# 集計表の形式の版。集計内容を変えたら上げてください（読み込み側のキャッシュの版と組み合わせて保存します）。
+SUMMARY_VERSION = "1"
+VERSION = f"{CACHE_VERSION}-{SUMMARY_VERSION}"
+
+
+def compute_summaries(df: pd.DataFrame) -> dict:
+    """読み込み済みのDataFrameから各ブロック用の集計表を作成します。必要な列がない集計は作りません。"""
+    out = {}
+    cols = set(df.columns)
+    amt = "合計出荷金額"
+    if amt not in cols:
+        return out
+
+    # ブロック7: 月次（Net/Paid/Returnsを1回のgroupbyで集計）
+    if {"year_month","返品フラグ"} <= cols:
+        a = df[amt].to_numpy()
+        m = pd.DataFrame({
+            "year_month": df["year_month"].to_numpy(),
+            "NetSales": a,
+            "PaidSales": np.where(a > 0, a, 0.0),
+            "Returns": np.where(df["返品フラグ"].to_numpy() == 1, np.abs(a), 0.0),
+        })
+        out["monthly_summary"] = m.groupby("year_month", observed=True, sort=True).sum().reset_index()
+
+    # ブロック8: 顧客（法人グループ/店舗）
+    if set(CUSTOMER_GROUP_KEYS) <= cols:
+        out["customer_group_summary"] = df.groupby(CUSTOMER_GROUP_KEYS, as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Stores=("出荷先顧客店舗ID","nunique"),
+            Lines=(amt,"size"))
+    if set(STORE_KEYS) <= cols:
+        out["store_summary"] = df.groupby(STORE_KEYS, as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Lines=(amt,"size"))
+
+    # ブロック9: 製品（グループ/サブカテゴリ/製品）
+    if "製品グループ名" in cols:
+        out["product_group_summary"] = df.groupby("製品グループ名", as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Items=("製品名称","nunique"),
+            Lines=(amt,"size"))
+    if "製品サブカテゴリ名" in cols:
+        out["product_subcategory_summary"] = df.groupby("製品サブカテゴリ名", as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Items=("製品名称","nunique"))
+    if "製品名称" in cols:
+        out["product_item_summary"] = df.groupby("製品名称", as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"))
+
+    # ブロック10: 地域（都道府県）
+    if "所在都道府県" in cols:
+        out["prefecture_summary"] = df.groupby("所在都道府県", as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Stores=("出荷先顧客店舗ID","nunique"))
+
+    # ブロック11: 担当者（顧客/自社）
+    if set(REPS_CUSTOMER_KEYS) <= cols:
+        out["reps_customer_summary"] = df.groupby(REPS_CUSTOMER_KEYS, as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Customers=("請求先顧客法人グループID","nunique"))
+    if set(REPS_COMPANY_KEYS) <= cols:
+        out["reps_company_summary"] = df.groupby(REPS_COMPANY_KEYS, as_index=False, observed=True).agg(
+            NetSales=(amt,"sum"),
+            Accounts=("請求先顧客法人グループID","nunique"))
+    return out
+
+
+def load_summary(path, name: str):
+    """集計表を1つ読み込みます。CSVと同じ場所の <CSV名>_summaries/ にParquetで保存し、CSVより新しく版（VERSION）も同じなら再利用します。
+    書き込めない場所のCSVは、保存せずに毎回集計します。
+
+    必要な列がなく作成できない集計表の場合は None を返します。
+    """
+    csv_path = Path(path)
+    cache_dir = csv_path.with_name(csv_path.stem + "_summaries")
+    cache_path = cache_dir / f"{name}.parquet"
+    if is_fresh(cache_path, csv_path, VERSION):
+        return pd.read_parquet(cache_path, engine="pyarrow")
+
+    # いずれかが古い・未作成なら、全集計を1回の読み込みから作り直して保存
+    frames = compute_summaries(load(csv_path))
+    out = None
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        for n, f in frames.items():
+            out = cache_dir / f"{n}.parquet"
+            write_parquet(f, out, VERSION)
+    except OSError:
+        # 書き込めない（読み取り専用など）場合は保存せずに返します（書きかけのファイルは消します）
+        if out is not None:
+            with suppress(OSError):
+                out.unlink(missing_ok=True)
+    return frames.get(name)